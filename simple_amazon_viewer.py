@@ -1,8 +1,12 @@
 # simple_amazon_viewer.py
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 st.set_page_config(page_title="Amazon CSV Search", layout="wide")
 
@@ -16,6 +20,8 @@ CSV_FILES: Dict[str, str] = {
     "Tablets": "amazon_tablets.csv"
 }
 
+CSV_COLUMNS = ["title", "price", "mrp", "discount_percentage", "link"]
+
 st.sidebar.title("Options")
 
 # Keep category selector but default to Laptops (used only when NOT doing global search)
@@ -30,31 +36,111 @@ search_all = st.sidebar.checkbox(
     value=True
 )
 
-@st.cache_data
-def load_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
+def sidecar_key(stat: os.stat_result) -> Dict[bytes, bytes]:
+    # Identifies the exact CSV a sidecar was written from; mtime alone is not
+    # enough since cp -p / rsync -t / unzip can install an older-dated file.
+    return {
+        b"source_mtime_ns": str(stat.st_mtime_ns).encode(),
+        b"source_size": str(stat.st_size).encode(),
+    }
+
+def read_sidecar(parquet_path: Path, stat: os.stat_result) -> Optional[pd.DataFrame]:
+    # Returns None when the sidecar is missing, stale or unreadable.
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        if any(metadata.get(k) != v for k, v in sidecar_key(stat).items()):
+            return None
+        return pq.read_table(parquet_path, columns=CSV_COLUMNS).to_pandas()
+    except Exception:
+        return None
+
+def write_sidecar(df: pd.DataFrame, parquet_path: Path, stat: os.stat_result) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **sidecar_key(stat)})
+    # Write to a temp file and rename so a killed or racing writer never leaves
+    # a truncated sidecar at the final path.
+    fd, tmp_path = tempfile.mkstemp(dir=parquet_path.parent, suffix=".parquet.tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression="snappy")
+        os.replace(tmp_path, parquet_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+@st.cache_data(show_spinner=False)
+def load_csv(path: str, category: str, mtime_ns: int) -> pd.DataFrame:
+    # mtime_ns only keys the cache so an edited CSV is reloaded.
+    # Prefer a Parquet sidecar next to the CSV; (re)write one whenever it is
+    # missing or does not match the CSV so later launches skip CSV parsing.
+    stat = Path(path).stat()
+    parquet_path = Path(path).with_suffix(".parquet")
+    df = read_sidecar(parquet_path, stat)
+    if df is None:
+        df = pd.read_csv(path, engine="pyarrow", usecols=CSV_COLUMNS)
+        try:
+            write_sidecar(df, parquet_path, stat)
+        except Exception:
+            # The sidecar is only a cache; never fail a load over it.
+            pass
+    df["Category"] = category
+    # Lower-cased concatenation of every column, built once so searches are a
+    # single vectorized substring scan instead of a row-wise apply. Cells are
+    # joined with "\n", which a stripped text_input never contains, so a match
+    # cannot span two columns. Missing cells contribute nothing rather than a
+    # version-dependent "none"/"nan" placeholder.
+    df["_search"] = df.astype("string").fillna("").agg("\n".join, axis=1).str.lower()
+    return df
+
+@st.cache_data(show_spinner=False)
+def load_all(files_mtimes: tuple) -> pd.DataFrame:
+    # Cached on the CSV mtimes so switching categories does not re-concat.
+    return pd.concat(
+        [
+            load_csv(path, cat, mtime_ns)
+            for (cat, path), mtime_ns in zip(CSV_FILES.items(), files_mtimes)
+        ],
+        ignore_index=True,
+    )
 
-# Load CSVs and add Category column
+@st.cache_data(max_entries=64)
+def filter_df(_df: pd.DataFrame, category_key: str, query: str, files_mtimes: tuple) -> pd.DataFrame:
+    # _df is not hashed; category_key and files_mtimes tell the cache which frame it is.
+    if query:
+        mask = _df["_search"].str.contains(query.lower(), regex=False, na=False)
+        _df = _df[mask]
+    return _df.drop(columns=["_search"]).reset_index(drop=True)
+
+@st.cache_data(max_entries=16)
+def to_csv_bytes(_df: pd.DataFrame, scope: str, query: str, files_mtimes: tuple) -> bytes:
+    # _df is not hashed; (scope, query, files_mtimes) identifies the filtered result.
+    return _df.to_csv(index=False).encode("utf-8")
+
+# Load each category's CSV, stat'ing every file once so the per-category
+# frames and the combined frame are keyed on the same mtimes
 missing = []
 dfs = {}
+mtimes = []
 for cat, path in CSV_FILES.items():
     p = Path(path)
     if not p.exists():
         missing.append(path)
     else:
+        mtime_ns = p.stat().st_mtime_ns
+        mtimes.append(mtime_ns)
         try:
-            df = load_csv(str(p))
+            df = load_csv(str(p), cat, mtime_ns)
         except Exception as e:
             st.error(f"Error loading {path}: {e}")
             st.stop()
-        df["Category"] = cat
         dfs[cat] = df
 
 if missing:
     st.error(f"CSV file(s) not found: {', '.join(missing)}")
     st.stop()
 
-df_all = pd.concat(dfs.values(), ignore_index=True)
+files_mtimes = tuple(mtimes)
+df_all = load_all(files_mtimes)
 
 st.title("Amazon Products Viewer")
 if search_all:
@@ -62,26 +148,21 @@ if search_all:
 else:
     st.caption(f"Searching within category: {category}")
 
-# Place single search box at top. Press Enter to apply.
-query = st.text_input("Enter search term").strip()
+# Place single search box at top. Only applied on Enter / Search, not per keystroke.
+with st.form("search"):
+    query = st.text_input("Enter search term").strip()
+    st.form_submit_button("Search")
 
 # Use global DF if search_all True; otherwise use selected category DF
 if search_all:
-    df_to_search = df_all.copy()
+    df_to_search = df_all
     download_name_prefix = "global"
 else:
-    df_to_search = dfs[category].copy()
+    df_to_search = dfs[category]
     download_name_prefix = category.lower()
 
 # Filter
-if query:
-    mask = df_to_search.apply(
-        lambda row: row.astype(str).str.contains(query, case=False, na=False).any(),
-        axis=1
-    )
-    filtered = df_to_search[mask].reset_index(drop=True)
-else:
-    filtered = df_to_search.reset_index(drop=True)
+filtered = filter_df(df_to_search, download_name_prefix, query, files_mtimes)
 
 st.write(f"Showing {len(filtered)} results")
 
@@ -95,7 +176,7 @@ st.dataframe(filtered, width="stretch")
 
 st.download_button(
     "Download results as CSV",
-    data=filtered.to_csv(index=False).encode("utf-8"),
+    data=to_csv_bytes(filtered, download_name_prefix, query, files_mtimes),
     file_name=f"{download_name_prefix}_filtered.csv",
     mime="text/csv",
 )